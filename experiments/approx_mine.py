@@ -0,0 +1,192 @@
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from statistics import NormalDist
+
+from auto_mine import mine
+
+# (dataset, threshold as a fraction of total utility)
+RUNS = [
+    ("subsamples/sub_25.txt", 0.005),
+    ("../data/shortened_chainstore.txt", 0.025),
+]
+SAMPLE_FRACTION = 0.25
+SEEDS = [0, 1, 2]
+
+# a transaction worth the whole scaled threshold makes every one of its subsets
+# a candidate; up to 2^MAX_ENUM_LEN of them the engines still get through
+# quickly, so the threshold is kept at least TU_MARGIN above the utility of
+# every longer transaction
+MAX_ENUM_LEN = 16
+TU_MARGIN = 1.1
+
+
+def compute_total_utility(path):
+    total = 0.0
+    with open(path) as f:
+        for line in f:
+            parts = line.strip().split(':')
+            if len(parts) < 2:
+                continue
+            total += float(parts[1])
+    return total
+
+
+def max_transaction_utility(path, min_len=0):
+    # largest utility among transactions with more than min_len items
+    largest = 0.0
+    with open(path) as f:
+        for line in f:
+            parts = line.strip().split(':')
+            if len(parts) < 2 or len(parts[0].split()) <= min_len:
+                continue
+            largest = max(largest, float(parts[1]))
+    return largest
+
+
+def create_sample(input_path, fraction, seed=None):
+    # Bernoulli sample: every transaction is kept independently with prob fraction
+    rng = random.Random(seed)
+    with open(input_path) as src, tempfile.NamedTemporaryFile(
+            'w', suffix='.txt', prefix='sample_', delete=False) as dst:
+        for line in src:
+            if line.strip() and rng.random() < fraction:
+                dst.write(line.rstrip('\n') + '\n')
+    return dst.name
+
+
+def read_transactions(path):
+    transactions = []
+    with open(path) as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            parts = line.split(':')
+            items = list(map(int, parts[0].split()))
+            utils = list(map(float, parts[2].split()))
+            transactions.append(dict(zip(items, utils)))
+    return transactions
+
+
+def index_transactions(transactions):
+    tids = defaultdict(list)
+    for tid, trans in enumerate(transactions):
+        for i in trans:
+            tids[i].append(tid)
+    return tids
+
+
+def itemset_utilities(cand, transactions, tids):
+    # utility of cand in every transaction holding it; only transactions with
+    # its rarest item need checking
+    rarest = min(cand, key=lambda i: len(tids[i]))
+    for t in tids[rarest]:
+        trans = transactions[t]
+        if all(i in trans for i in cand):
+            yield sum(trans[i] for i in cand)
+
+
+def estimate_utilities(sample_utils, sample_path, fraction, confidence):
+    # Horvitz-Thompson estimate of each itemset's full utility; the sample
+    # utilities come from the engine, only their sums of squares need a scan
+    transactions = read_transactions(sample_path)
+    tids = index_transactions(transactions)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    estimates = {}
+    for cand, util in sample_utils.items():
+        squares = sum(u * u for u in itemset_utilities(cand, transactions, tids))
+        est = util / fraction
+        err = z * ((1 - fraction) * squares) ** 0.5 / fraction
+        estimates[cand] = (est, max(0.0, est - err), est + err)
+    return estimates
+
+
+def verify_itemsets(file_path, itemsets, minutil):
+    transactions = read_transactions(file_path)
+    tids = index_transactions(transactions)
+    exact = {cand: sum(itemset_utilities(cand, transactions, tids)) for cand in itemsets}
+    return {c: u for c, u in exact.items() if u >= minutil}
+
+
+def get_approx_high_utility_itemsets(file_path, minutil, fraction=SAMPLE_FRACTION, slack=0.1,
+                                     confidence=0.95, algorithm="hui", verify=False, seed=None):
+    if minutil <= 0:
+        raise ValueError(f"minutil must be positive: {minutil}")
+    if not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1]: {fraction}")
+    if not 0 <= slack < 1:
+        raise ValueError(f"slack must be in [0, 1): {slack}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1): {confidence}")
+
+    # sample enough that no long transaction reaches the scaled threshold alone
+    needed = TU_MARGIN * max_transaction_utility(file_path, MAX_ENUM_LEN) / (minutil * (1 - slack))
+    if needed > fraction:
+        print(f"Raising sample fraction {fraction:.0%} -> {min(needed, 1):.0%}: "
+              f"a single long transaction reaches the scaled threshold")
+        fraction = min(needed, 1.0)
+
+    if fraction == 1:
+        # the sample would be the whole dataset, so mine it exactly
+        found = mine(file_path, minutil, algorithm)
+        estimates = {c: (u, u, u) for c, u in found.items()}
+    else:
+        sample_path = create_sample(file_path, fraction, seed)
+        try:
+            # scale the threshold to the sample and lower it so borderline itemsets survive
+            sample_minutil = minutil * fraction * (1 - slack)
+            found = mine(sample_path, sample_minutil, algorithm)
+            estimates = estimate_utilities(found, sample_path, fraction, confidence)
+        finally:
+            os.remove(sample_path)
+
+    # the lowered threshold only keeps borderline itemsets in the mining; report
+    # those whose estimate reaches minutil, surest (highest lower bound) first
+    mined = len(estimates)
+    estimates = {c: v for c, v in sorted(estimates.items(), key=lambda x: x[1][1], reverse=True)
+                 if v[0] >= minutil}
+    confident = sum(v[1] >= minutil for v in estimates.values())
+    print(f"Approx @{minutil} ({fraction:.0%} sample, {algorithm}): {len(estimates)}/{mined} "
+          f"mined itemsets estimated as HUIs, {confident} with lower bound >= minutil")
+
+    if verify:
+        confirmed = verify_itemsets(file_path, estimates, minutil)
+        print(f"Verified {len(confirmed)}/{len(estimates)} itemsets on full data")
+        # confirmed utilities are exact, so their interval collapses
+        estimates = {c: (u, u, u) for c, u in confirmed.items()}
+    return estimates
+
+
+def precision_recall(approx, exact):
+    hits = len(approx.keys() & exact.keys())
+    precision = hits / len(approx) if approx else 1.0
+    recall = hits / len(exact) if exact else 1.0
+    return precision, recall
+
+
+def run():
+    for file_path, util_thresh in RUNS:
+        minutil = util_thresh * compute_total_utility(file_path)
+        start = time.perf_counter()
+        exact = mine(file_path, minutil, "hui")
+        exact_time = time.perf_counter() - start
+        print(f"Exact {file_path} @{util_thresh}: {len(exact)} HUIs in {exact_time:.2f}s")
+
+        for seed in SEEDS:
+            for verify in (False, True):
+                start = time.perf_counter()
+                approx = get_approx_high_utility_itemsets(file_path, minutil, verify=verify, seed=seed)
+                approx_time = time.perf_counter() - start
+                precision, recall = precision_recall(approx, exact)
+                confident = {c: v for c, v in approx.items() if v[1] >= minutil}
+                c_precision, c_recall = precision_recall(confident, exact)
+                print(f"seed={seed} verify={verify}: {approx_time:.2f}s vs exact {exact_time:.2f}s, "
+                      f"precision {precision:.2f}, recall {recall:.2f} "
+                      f"(confident only: {c_precision:.2f}, {c_recall:.2f})")
+
+
+if __name__ == '__main__':
+    run()
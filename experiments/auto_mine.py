@@ -0,0 +1,227 @@
+import json
+import math
+import os
+from collections import Counter
+
+from two_phase import get_high_utility_itemsets as two_phase
+from ihup import get_high_utility_itemsets as ihup_tree
+from hui import get_high_utility_itemsets as huiminer
+from up_growth import get_high_utility_itemsets as up_growth
+
+FILE_PATH = "../data/shortened_chainstore.txt"
+MIN_UTIL = 45000
+
+ENGINES = {
+    'two_phase': two_phase,
+    'ihup': ihup_tree,
+    'up_growth': up_growth,
+    'hui': huiminer,
+}
+
+# Item orders each engine supports, its own default first
+ORDERS = {
+    'hui': ['twu_asc', 'twu_desc', 'item'],
+    'ihup': ['item', 'twu_desc', 'twu_asc'],
+    'up_growth': ['twu_desc', 'twu_asc', 'item'],
+}
+
+# Fitted seconds per unit of modelled work and per-order speedup models,
+# written by calibrate.py from runs over data/ and subsamples/
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "results", "calibration.json")
+
+# A non-default order is only chosen when it is predicted at least this much faster
+MIN_ORDER_SPEEDUP = 1.1
+
+def load_calibration(path=CALIBRATION_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def profile_dataset(file_path, minutil):
+    n_trans = 0
+    total_util = 0.0
+    total_len = 0
+    max_len = 0
+    len_hist = Counter()
+    twu = Counter()
+    support = Counter()
+    with open(file_path, 'r') as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            parts = line.split(':')
+            items = parts[0].split()
+            tu = float(parts[1])
+
+            n_trans += 1
+            total_util += tu
+            total_len += len(items)
+            max_len = max(max_len, len(items))
+            # bucket lengths by powers of two: 1, 2-3, 4-7, ... (0 for empty)
+            len_hist[1 << (len(items).bit_length() - 1) if items else 0] += 1
+            for i in items:
+                twu[i] += tu
+                support[i] += 1
+
+    n_items = len(twu)
+    surviving = [i for i, tw in twu.items() if tw >= minutil]
+    avg_len = total_len / n_trans if n_trans else 0.0
+    # every occurrence of a surviving item stays in its transaction after DGU
+    avg_surviving_len = sum(support[i] for i in surviving) / n_trans if n_trans else 0.0
+
+    # share of surviving TWU held by the top tenth of surviving items; only
+    # surviving items get ordered, so this is what the item order sees
+    surviving_twu = sorted((twu[i] for i in surviving), reverse=True)
+    top = surviving_twu[:max(1, len(surviving) // 10)]
+    total_twu = sum(surviving_twu)
+    twu_skew = sum(top) / total_twu if total_twu else 0.0
+
+    return {
+        'transactions': n_trans,
+        'items': n_items,
+        'total_util': total_util,
+        'avg_len': avg_len,
+        'max_len': max_len,
+        'len_hist': dict(sorted(len_hist.items())),
+        'density': avg_len / n_items if n_items else 0.0,
+        'twu_skew': twu_skew,
+        'surviving_items': len(surviving),
+        'avg_surviving_len': avg_surviving_len,
+    }
+
+
+def mean_square_len(len_hist):
+    # bucket b holds lengths b..2b-1, so each bucket counts at its midpoint
+    n = sum(len_hist.values())
+    if not n:
+        return 0.0
+    total = 0.0
+    for bucket, count in len_hist.items():
+        b = int(bucket)  # keys come back as strings from calibration.json
+        mid = (b + 2 * b - 1) / 2 if b else 0.0
+        total += count * mid * mid
+    return total / n
+
+
+def engine_work(profile):
+    n = profile['transactions']
+    S = profile['surviving_items']
+    L = profile['avg_surviving_len']
+    # density of the data left after TWU pruning
+    ds = L / S if S else 0.0
+    L_all = profile['avg_len']
+    # quadratic terms follow the second moment of the length histogram, which
+    # a few long transactions push far above the squared mean
+    L2_all = mean_square_len(profile['len_hist'])
+    # TWU pruning keeps about the same share of every transaction
+    L2 = L2_all * (L / L_all) ** 2 if L_all else 0.0
+    # length of the transaction an average item occurrence sits in
+    L_occ = L2_all / L_all if L_all else 0.0
+    # the more TWU sits on a few items, the more tree paths share their prefix
+    shared = 1 - profile['twu_skew'] / 2
+
+    # every engine parses every item occurrence once
+    scan = n * L_all
+    # utility lists: quadratic remaining-utility sums per revised transaction
+    list_work = n * (L + L2 / 2)
+    # mining joins each surviving item's occurrences against the other items
+    join_work = n * L * S
+
+    work = {}
+    work['hui'] = scan + list_work + join_work
+    # UP tree shares prefixes on dense data, DGU/DLU keep candidates close to S
+    work['up_growth'] = scan + (list_work + join_work) * (1 - ds / 2) * shared
+    # IHUP tree keeps every item, so each projection walks the whole prefix of
+    # a surviving occurrence, and it verifies every TWU candidate
+    work['ihup'] = n * (L_all + L2_all / 2) * shared + n * L * L_occ + n * S * L
+    # Apriori level-2 TWU scan dominates Two-Phase
+    work['two_phase'] = scan + n * S * (S - 1) / 2
+    return work
+
+
+def order_speedups(engine, profile, calibration):
+    # each order's speedup over the engine's own order, log-linear in TWU skew
+    # and capped at the largest speedup measured; outside the skew range the
+    # line was fitted on there is nothing to go on, so the order is left out
+    skew = profile['twu_skew']
+    speedups = {}
+    for order, model in calibration['order_model'].get(engine, {}).items():
+        low, high = model['skew_range']
+        if not low <= skew <= high:
+            continue
+        a, b = model['line']
+        speedups[order] = min(math.exp(a + b * skew), model['max_speedup'])
+    return speedups
+
+
+def choose_item_order(engine, profile, calibration):
+    # keep the engine's own order unless the profile predicts a clear win
+    speedups = order_speedups(engine, profile, calibration)
+    if not speedups:
+        return None, 1.0
+    order = max(speedups, key=speedups.get)
+    if order == ORDERS[engine][0] or speedups[order] < MIN_ORDER_SPEEDUP:
+        return None, 1.0
+    return order, speedups[order]
+
+
+def estimate_costs(profile, calibration, engines=ENGINES, order=None):
+    # modelled seconds for each engine, run with the requested item order or,
+    # without one, the order chosen for it
+    work = engine_work(profile)
+    coefficients = calibration['coefficients']
+    costs = {}
+    orders = {}
+    for e in engines:
+        if order is None:
+            orders[e], speedup = choose_item_order(e, profile, calibration)
+        else:
+            # no prediction for this profile: assume the order costs the same as the default
+            orders[e], speedup = order, order_speedups(e, profile, calibration).get(order, 1.0)
+        costs[e] = coefficients[e] * work[e] / speedup
+    return costs, orders
+
+
+def choose_engine(profile, calibration, engines=ENGINES, order=None):
+    costs, orders = estimate_costs(profile, calibration, engines, order)
+    engine = min(costs, key=costs.get)
+    return engine, orders[engine], costs
+
+
+def normalize_results(results):
+    if isinstance(results, dict):
+        results = results.items()
+    return {tuple(sorted(int(i) for i in itemset)): util for itemset, util in results}
+
+
+def mine(file_path, minutil, algorithm="auto", order=None):
+    if algorithm == "auto":
+        profile = profile_dataset(file_path, minutil)
+        print(f"Profile {file_path} @{minutil}: {profile}")
+        # an explicit order restricts the choice to engines that support one
+        engines = ORDERS if order else ENGINES
+        algorithm, order, costs = choose_engine(profile, load_calibration(), engines, order)
+        print(f"Auto selected {algorithm} (order={order or 'default'}), "
+              f"est. costs: { {e: round(c, 3) for e, c in sorted(costs.items(), key=lambda x: x[1])} }")
+    elif algorithm not in ENGINES:
+        raise ValueError(f"unknown algorithm: {algorithm}")
+
+    if order is None:
+        results = ENGINES[algorithm](file_path, minutil)
+    elif algorithm not in ORDERS:
+        raise ValueError(f"{algorithm} does not support an item order")
+    else:
+        results = ENGINES[algorithm](file_path, minutil, order)
+    return normalize_results(results)
+
+
+def run():
+    results = mine(FILE_PATH, MIN_UTIL)
+    print(f"Run complete: found {len(results)} HUIs @ {MIN_UTIL}")
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,181 @@
+import json
+import math
+import os
+import time
+from statistics import median
+
+from auto_mine import (ENGINES, ORDERS, CALIBRATION_PATH, profile_dataset, engine_work,
+                       choose_engine, load_calibration)
+
+# (dataset, thresholds as a fraction of total utility)
+CALIBRATION_RUNS = [
+    ("../data/shortened_chainstore.txt", [0.015, 0.025]),
+    ("subsamples/sub_10.txt", [0.005, 0.01]),
+    ("subsamples/sub_25.txt", [0.005, 0.01]),
+]
+
+# each run is timed this many times and the median kept, except runs slower
+# than REPEAT_LIMIT seconds, where one timing is already stable enough
+REPEATS = 3
+REPEAT_LIMIT = 30
+
+# runs faster than this are mostly timing noise, so they stay out of the order fit
+MIN_FIT_RUNTIME = 0.1
+
+
+def compute_total_utility(file_path):
+    total = 0.0
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split(':')
+            total += float(parts[1])
+    return total
+
+
+def measure_runtime_once(func, path, minutil, *args):
+    start = time.perf_counter()
+    func(path, minutil, *args)
+    return time.perf_counter() - start
+
+
+def measure_runtime(func, path, minutil, *args):
+    runtimes = [measure_runtime_once(func, path, minutil, *args)]
+    while runtimes[0] < REPEAT_LIMIT and len(runtimes) < REPEATS:
+        runtimes.append(measure_runtime_once(func, path, minutil, *args))
+    return median(runtimes)
+
+
+def measure():
+    profiles = []
+    measurements = []
+    for path, thresholds in CALIBRATION_RUNS:
+        total_util = compute_total_utility(path)
+        for pct in thresholds:
+            minutil = pct * total_util
+            profiles.append({'path': path, 'threshold': pct,
+                             'profile': profile_dataset(path, minutil)})
+            for engine, func in ENGINES.items():
+                for order in ORDERS.get(engine, [None]):
+                    args = (order,) if order else ()
+                    runtime = measure_runtime(func, path, minutil, *args)
+                    print(f"{engine} ({order}) {path} @{pct}: {runtime:.3f}s")
+                    measurements.append({
+                        'path': path, 'threshold': pct, 'engine': engine,
+                        'order': order, 'runtime': runtime,
+                    })
+    return profiles, measurements
+
+
+def profile_lookup(profiles):
+    # every measurement refers to its profile by (path, threshold)
+    return {(p['path'], p['threshold']): p['profile'] for p in profiles}
+
+
+def fit_line(points):
+    # least squares intercept and slope; a flat line when x does not vary
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return mean_y - slope * mean_x, slope
+
+
+def fit(profiles, measurements):
+    lookup = profile_lookup(profiles)
+
+    # seconds per unit of modelled work, measured with each engine's default order
+    coefficients = {}
+    for engine in ENGINES:
+        default = ORDERS.get(engine, [None])[0]
+        ratios = []
+        for m in measurements:
+            work = engine_work(lookup[(m['path'], m['threshold'])])[engine]
+            if m['engine'] == engine and m['order'] == default and work > 0:
+                ratios.append(m['runtime'] / work)
+        coefficients[engine] = median(ratios)
+
+    # log speedup of each order over the engine's default order, fitted as a
+    # line in the profile's TWU skew on runs slow enough to time reliably
+    order_model = {}
+    for engine, orders in ORDERS.items():
+        default = {(m['path'], m['threshold']): m['runtime'] for m in measurements
+                   if m['engine'] == engine and m['order'] == orders[0]}
+        order_model[engine] = {}
+        for order in orders:
+            points = []
+            for m in measurements:
+                key = (m['path'], m['threshold'])
+                if m['engine'] != engine or m['order'] != order:
+                    continue
+                if min(m['runtime'], default[key]) < MIN_FIT_RUNTIME:
+                    continue
+                points.append((lookup[key]['twu_skew'], default[key] / m['runtime']))
+            if not points:
+                continue
+            skews = [x for x, _ in points]
+            order_model[engine][order] = {
+                'line': fit_line([(x, math.log(y)) for x, y in points]),
+                'max_speedup': max(y for _, y in points),
+                'skew_range': [min(skews), max(skews)],
+            }
+
+    return {
+        'coefficients': coefficients,
+        'order_model': order_model,
+        'profiles': profiles,
+        'measurements': measurements,
+    }
+
+
+def held_out(profiles, measurements):
+    # leave one dataset out, fit on the rest and check the choice on its runs
+    lookup = profile_lookup(profiles)
+    checks = []
+    for path, _ in CALIBRATION_RUNS:
+        calibration = fit([p for p in profiles if p['path'] != path],
+                          [m for m in measurements if m['path'] != path])
+        runs = [m for m in measurements if m['path'] == path]
+        for pct in sorted({m['threshold'] for m in runs}):
+            point = [m for m in runs if m['threshold'] == pct]
+            engine, order, _ = choose_engine(lookup[(path, pct)], calibration)
+            order = order or ORDERS.get(engine, [None])[0]
+            chosen = next(m for m in point if m['engine'] == engine and m['order'] == order)
+            best = min(point, key=lambda m: m['runtime'])
+            checks.append({
+                'path': path, 'threshold': pct,
+                'chosen': [engine, order], 'chosen_runtime': chosen['runtime'],
+                'best': [best['engine'], best['order']], 'best_runtime': best['runtime'],
+                'slowdown': chosen['runtime'] / best['runtime'],
+            })
+    return checks
+
+
+def main(remeasure=True):
+    # remeasure=False refits the model to the runtimes already on disk
+    if remeasure:
+        profiles, measurements = measure()
+    else:
+        stored = load_calibration()
+        profiles, measurements = stored['profiles'], stored['measurements']
+    calibration = fit(profiles, measurements)
+    calibration['held_out'] = held_out(profiles, measurements)
+    os.makedirs(os.path.dirname(CALIBRATION_PATH), exist_ok=True)
+    with open(CALIBRATION_PATH, 'w') as f:
+        json.dump(calibration, f, indent=2)
+    print(f"Coefficients: {calibration['coefficients']}")
+    print(f"Order models: {calibration['order_model']}")
+    for c in calibration['held_out']:
+        print(f"Held out {c['path']} @{c['threshold']}: chose {c['chosen']} ({c['chosen_runtime']:.3f}s), "
+              f"best {c['best']} ({c['best_runtime']:.3f}s), {c['slowdown']:.2f}x")
+    right = sum(c['chosen'] == c['best'] for c in calibration['held_out'])
+    print(f"Held-out choices right: {right}/{len(calibration['held_out'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,15 +14,26 @@ def parse_transactions(lines, TWU, parsed_trans):
             TWU[item] += total_util
 
 
-def revise(parsed_trans, TWU, minutil):
+def item_order_key(TWU, order="twu_asc"):
+    if order == "twu_asc":
+        return lambda i: (TWU[i], i)
+    if order == "twu_desc":
+        return lambda i: (-TWU[i], i)
+    if order == "item":
+        return lambda i: i
+    raise ValueError(f"unknown item order: {order}")
+
+
+def revise(parsed_trans, TWU, minutil, order="twu_asc"):
     revised = []
     # keep items meeting TWU
     kept = {item for item, tw in TWU.items() if tw >= minutil}
-    # order by (TWU, item)
-    order = {item: idx for idx, item in enumerate(sorted(kept, key=lambda i: (TWU[i], i)))}
+    # order by the chosen item ordering, (TWU, item) by default
+    key = item_order_key(TWU, order)
+    rank = {item: idx for idx, item in enumerate(sorted(kept, key=key))}
     for tid, items, utils, _ in parsed_trans:
         filtered = [(item, util) for item, util in zip(items, utils) if item in kept]
-        filtered.sort(key=lambda x: order[x[0]])
+        filtered.sort(key=lambda x: rank[x[0]])
         if filtered:
             revised.append((tid, filtered))
     return revised
@@ -79,7 +90,7 @@ def huiMiner(prefix, ULs, minutil, prefix_ul=None, results=None):
     return results
 
 
-def get_high_utility_itemsets(file_path, minutil):
+def get_high_utility_itemsets(file_path, minutil, order="twu_asc"):
     TWU = defaultdict(float)
     parsed_trans = []  # will hold (tid, items, item_utils, total_util)
     with open(file_path, 'r') as f:
@@ -96,11 +107,13 @@ def get_high_utility_itemsets(file_path, minutil):
             for i in items:
                 TWU[i] += total_util
 
-    revised = revise(parsed_trans, TWU, minutil)
+    revised = revise(parsed_trans, TWU, minutil, order)
 
     UL_map = build_utility_lists(revised)
 
-    sorted_ULs = sorted(UL_map.items(), key=lambda x: TWU[x[0]])
+    # utility lists must be processed in the same order used by revise
+    key = item_order_key(TWU, order)
+    sorted_ULs = sorted(UL_map.items(), key=lambda x: key(x[0]))
     huis = huiMiner(tuple(), sorted_ULs, minutil)
 
     return huis
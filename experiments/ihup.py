@@ -90,9 +90,22 @@ def exact_high_utils(candidates, transactions, minutil):
     return high_utils
 
 
-def get_high_utility_itemsets(file_path, minutil):
+def item_order_key(twu, order="item"):
+    if order == "item":
+        return lambda x: int(x)
+    if order == "twu_desc":
+        return lambda x: (-twu[x], int(x))
+    if order == "twu_asc":
+        return lambda x: (twu[x], int(x))
+    raise ValueError(f"unknown item order: {order}")
+
+
+def get_high_utility_itemsets(file_path, minutil, order="item"):
     transactions = [] 
     tree = IHUPTree()
+    twu = {}
+    pending = []
+    key = item_order_key(twu, order)
     with open(file_path, 'r') as f:
         for raw in f:
             line = raw.strip()
@@ -110,7 +123,16 @@ def get_high_utility_itemsets(file_path, minutil):
 
             transactions.append((items, utils))
 
-            tree.insert_transaction(items, total_util) 
+            if order == "item":
+                tree.insert_transaction(items, total_util) 
+            else:
+                # TWU based orders need every transaction read before insertion
+                pending.append((items, total_util))
+                for i in items:
+                    twu[i] = twu.get(i, 0) + total_util
+
+    for items, total_util in pending:
+        tree.insert_transaction(sorted(items, key=key), total_util)
 
     candidates = {}
     get_candidates(tree, minutil, [], candidates)
@@ -77,7 +77,7 @@ def get_prefix_path(node):
         current = current.parent
     return path
 
-def get_projected_tree(full_tree, item):
+def get_projected_tree(full_tree, item, minutil):
     proj = UPTree()
     
     # Collect all prefix paths
@@ -99,7 +99,7 @@ def get_projected_tree(full_tree, item):
         filtered = []
         adj_path_util = path_util
         for p in path:
-            if item_path_util[p] >= MIN_UTIL:
+            if item_path_util[p] >= minutil:
                 filtered.append(p)
             else:
                 adj_path_util -= full_tree.min_item_util[p] * count
@@ -123,7 +123,7 @@ def get_candidates(tree, minutil, prefix, candidates):
             continue
         key = tuple(prefix + [item])
         candidates[key] = path_util
-        proj = get_projected_tree(tree, item)
+        proj = get_projected_tree(tree, item, minutil)
         if proj.header_list:
             get_candidates(proj, minutil, prefix + [item], candidates)
 
@@ -143,7 +143,17 @@ def exact_high_utils(candidates, transactions, minutil):
     return high_utils
 
 
-def get_high_utility_itemsets(file_path, minutil):
+def item_order_key(twu, order="twu_desc"):
+    if order == "twu_desc":
+        return lambda x: (-twu[x], int(x))
+    if order == "twu_asc":
+        return lambda x: (twu[x], int(x))
+    if order == "item":
+        return lambda x: int(x)
+    raise ValueError(f"unknown item order: {order}")
+
+
+def get_high_utility_itemsets(file_path, minutil, order="twu_desc"):
     twu = {}
     transactions = []
     with open(file_path) as f:
@@ -163,6 +173,7 @@ def get_high_utility_itemsets(file_path, minutil):
 
 
     # DGU pruning and create tree
+    key = item_order_key(twu, order)
     tree = UPTree()
     for ids, utils in transactions:
         filtered_items = []
@@ -175,12 +186,12 @@ def get_high_utility_itemsets(file_path, minutil):
                 prev = tree.min_item_util.get(i)
                 if prev is None or u < prev:
                     tree.min_item_util[i] = u
-        filtered_items.sort(key=lambda x: (-twu[x[0]], int(x[0])))
+        filtered_items.sort(key=lambda x: key(x[0]))
         if filtered_items:
             tree.insert_transaction(filtered_items, filtered_items_util)
 
     # Create and sort the header_list, denoting which order items should be processed
-    tree.header_list = sorted(tree.header_table.keys(),key=lambda x: (-twu[x], int(x)))
+    tree.header_list = sorted(tree.header_table.keys(), key=key)
 
     candidates = {}
     get_candidates(tree, minutil, [], candidates)